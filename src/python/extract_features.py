@@ -11,19 +11,120 @@ import json
 import numpy as np
 import librosa
 import re
+from joblib import Parallel, delayed
+
+# Canonical order of the handcrafted features; columnar outputs and
+# downstream feature matrices all follow this order.
+FEATURE_NAMES = (
+    'hesitation_count', 'pause_count', 'speech_rate', 'pitch_variability',
+    'semantic_anomaly', 'vague_word_count', 'incomplete_sentence', 'lost_words'
+)
+
+# Pre-compiled patterns and frozen word sets so each transcript is scanned
+# once rather than once per feature.
+_PAUSE_RE = re.compile(r'\.{2,}|,{2,}|--+')
+_LOST_RE = re.compile(
+    r'\b(?:that thing|you know|like|what\'s it called|what do you call it'
+    r'|I (?:can\'t remember|forgot|don\'t recall))\b',
+    re.IGNORECASE)
+_SENT_SPLIT = re.compile(r'[.!?]+')
+_INCOMPLETE_TAIL = re.compile(r'\b(?:and|but|or|so|because|if|when)\s*$')
+
+_HESITATION_WORDS = frozenset(['uh', 'um', 'er', 'ah', 'hmm', 'ehm'])
+_VAGUE_WORDS = frozenset(['thing', 'stuff', 'something', 'somewhere', 'somehow', 'whatever', 'whatsoever'])
+
+# Optional Numba fast path for very long transcripts: tokens are hashed to
+# int64 once and counted against sorted hash tables in a compiled kernel.
+# Short transcripts stay on the plain Python loop (JIT overhead dominates).
+_NUMBA_MIN_TOKENS = 4096
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_HESITATION_HASHES = np.sort(np.fromiter((hash(w) for w in _HESITATION_WORDS), dtype=np.int64))
+_VAGUE_HASHES = np.sort(np.fromiter((hash(w) for w in _VAGUE_WORDS), dtype=np.int64))
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_members(token_hashes, hesitation_hashes, vague_hashes):
+        hesitation_count = 0
+        vague_count = 0
+        for h in token_hashes:
+            i = np.searchsorted(hesitation_hashes, h)
+            if i < hesitation_hashes.size and hesitation_hashes[i] == h:
+                hesitation_count += 1
+            else:
+                j = np.searchsorted(vague_hashes, h)
+                if j < vague_hashes.size and vague_hashes[j] == h:
+                    vague_count += 1
+        return hesitation_count, vague_count
+
+def _split_sentences(text):
+    """Split text into cleaned, non-empty sentences."""
+    return [s.strip() for s in _SENT_SPLIT.split(text) if s.strip()]
+
+def _scan_text(text):
+    """
+    Scan a transcript once and compute all text-based features.
+
+    Lower-cases and tokenizes the text a single time, then derives every
+    count and heuristic from that shared pass instead of re-scanning the
+    string per feature.
+    """
+    words = text.lower().split()
+
+    if njit is not None and len(words) >= _NUMBA_MIN_TOKENS:
+        token_hashes = np.fromiter((hash(w) for w in words), dtype=np.int64, count=len(words))
+        hesitation_count, vague_word_count = _count_members(
+            token_hashes, _HESITATION_HASHES, _VAGUE_HASHES)
+    else:
+        hesitation_count = 0
+        vague_word_count = 0
+        for word in words:
+            if word in _HESITATION_WORDS:
+                hesitation_count += 1
+            elif word in _VAGUE_WORDS:
+                vague_word_count += 1
+
+    # Sentences are split once and shared by the incomplete-sentence and
+    # semantic-anomaly heuristics
+    sentences = _split_sentences(text)
+    lengths = [len(s.split()) for s in sentences]
+
+    # A sentence is incomplete if it's too short or trails off on a conjunction
+    incomplete_count = sum(
+        1 for sentence, length in zip(sentences, lengths)
+        if length < 3 or _INCOMPLETE_TAIL.search(sentence))
+
+    if len(sentences) < 2:
+        semantic_anomaly = 0.1  # Low anomaly for very short text
+    else:
+        # Higher variance in sentence length can indicate semantic anomalies
+        mean_length = np.mean(lengths)
+        std_length = np.std(lengths)
+        coefficient_of_variation = std_length / mean_length if mean_length > 0 else 0
+        semantic_anomaly = min(0.3, max(0.0, coefficient_of_variation * 0.15))
+
+    return {
+        "word_count": len(words),
+        "hesitation_count": hesitation_count,
+        "pause_count": len(_PAUSE_RE.findall(text)),
+        "vague_word_count": vague_word_count,
+        "incomplete_sentence": 1 if incomplete_count > 0 else 0,
+        "lost_words": len(_LOST_RE.findall(text)),
+        "semantic_anomaly": semantic_anomaly
+    }
 
 def count_hesitations(text):
     """Count hesitation markers in the transcript."""
-    hesitation_words = ['uh', 'um', 'er', 'ah', 'hmm', 'ehm']
-    words = text.lower().split()
-    return sum(1 for word in words if word in hesitation_words)
+    return _scan_text(text)["hesitation_count"]
 
 def count_pauses(text):
     """Count pause markers in the transcript."""
-    # Count ellipses, sequences of periods/commas, and dashes as pauses
-    pause_regex = r'\.{2,}|,{2,}|\.\.\.|--+'
-    matches = re.findall(pause_regex, text)
-    return len(matches)
+    # Ellipses, sequences of periods/commas, and dashes count as pauses
+    return _scan_text(text)["pause_count"]
 
 def speech_rate(text, duration_sec):
     """Calculate speech rate (words per minute)."""
@@ -32,22 +133,21 @@ def speech_rate(text, duration_sec):
     words = [w for w in text.split() if w.strip()]
     return len(words) / (duration_sec / 60)
 
-def calculate_pitch_variability(audio_path):
-    """Calculate pitch variability from audio."""
+def calculate_pitch_variability(y, sr):
+    """Calculate pitch variability from a loaded waveform."""
     try:
-        y, sr = librosa.load(audio_path, sr=None)
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-        
-        # Get the most prominent pitches
-        pitches_filtered = []
-        for i in range(pitches.shape[1]):
-            index = magnitudes[:, i].argmax()
-            pitch = pitches[index, i]
-            if pitch > 0:  # Filter out zero pitches
-                pitches_filtered.append(pitch)
-        
-        if pitches_filtered:
-            return np.std(pitches_filtered)
+        # yin gives the F0 track directly, far cheaper than the full
+        # STFT-plus-interpolation matrix piptrack builds; 16 kHz is ample
+        # for F0 up to 500 Hz, so downsample higher-rate audio first
+        if sr > 16000:
+            y = librosa.resample(y, orig_sr=sr, target_sr=16000)
+            sr = 16000
+
+        f0 = librosa.yin(y, fmin=50, fmax=500, sr=sr, frame_length=2048, hop_length=512)
+        f0 = f0[np.isfinite(f0) & (f0 > 0)]
+
+        if f0.size:
+            return float(f0.std())
         return 0
     except Exception as e:
         print(f"Error calculating pitch variability: {e}")
@@ -55,61 +155,24 @@ def calculate_pitch_variability(audio_path):
 
 def count_vague_words(text):
     """Count vague or placeholder words."""
-    vague_words = ['thing', 'stuff', 'something', 'somewhere', 'somehow', 'whatever', 'whatsoever']
-    words = text.lower().split()
-    return sum(1 for word in words if word in vague_words)
+    return _scan_text(text)["vague_word_count"]
 
 def is_incomplete_sentence(text):
     """Detect incomplete sentences."""
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    incomplete_count = 0
-    for sentence in sentences:
-        # Consider a sentence incomplete if it's too short or ends with certain words
-        if (len(sentence.split()) < 3 or 
-            re.search(r'\b(and|but|or|so|because|if|when)\s*$', sentence.strip())):
-            incomplete_count += 1
-    
-    return 1 if incomplete_count > 0 else 0
+    return _scan_text(text)["incomplete_sentence"]
 
 def count_lost_words(text):
     """Count phrases indicating word finding difficulty."""
-    lost_words_patterns = [
-        r'\b(that thing|you know|like|what\'s it called|what do you call it)\b',
-        r'\bI (can\'t remember|forgot|don\'t recall)\b'
-    ]
-    
-    count = 0
-    for pattern in lost_words_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        count += len(matches)
-    
-    return count
+    return _scan_text(text)["lost_words"]
 
 def calculate_semantic_anomaly(text):
     """
     Calculate semantic coherence or detect anomalies in speech.
-    
+
     In a real implementation, this would use a language model or embedding similarity.
     For this example, we use a simplified heuristic based on sentence length variance.
     """
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    if len(sentences) < 2:
-        return 0.1  # Low anomaly for very short text
-    
-    # Analyze sentence length variation
-    lengths = [len(s.split()) for s in sentences]
-    mean_length = np.mean(lengths)
-    std_length = np.std(lengths)
-    
-    # Higher variance in sentence length can indicate semantic anomalies
-    coefficient_of_variation = std_length / mean_length if mean_length > 0 else 0
-    
-    # Scale to a reasonable range (0.0 to 0.3)
-    return min(0.3, max(0.0, coefficient_of_variation * 0.15))
+    return _scan_text(text)["semantic_anomaly"]
 
 def extract_features(audio_path, transcript_text=None):
     """
@@ -134,72 +197,93 @@ def extract_features(audio_path, transcript_text=None):
             print(f"Warning: No transcript found for {audio_path}")
             transcript_text = ""
     
-    # Get audio duration
+    # Load audio once; duration and pitch analysis share the same waveform
     try:
         y, sr = librosa.load(audio_path, sr=None)
-        duration = librosa.get_duration(y=y, sr=sr)
+        duration = len(y) / sr
     except Exception as e:
         print(f"Error loading audio: {e}")
+        y, sr = np.array([]), 22050
         duration = 0
-    
-    # Extract features
+
+    # Extract features (single scan of the transcript)
+    scan = _scan_text(transcript_text)
     features = {
-        "hesitation_count": count_hesitations(transcript_text),
-        "pause_count": count_pauses(transcript_text),
-        "speech_rate": speech_rate(transcript_text, duration),
-        "pitch_variability": calculate_pitch_variability(audio_path),
-        "semantic_anomaly": calculate_semantic_anomaly(transcript_text),
-        "vague_word_count": count_vague_words(transcript_text),
-        "incomplete_sentence": is_incomplete_sentence(transcript_text),
-        "lost_words": count_lost_words(transcript_text)
+        "hesitation_count": scan["hesitation_count"],
+        "pause_count": scan["pause_count"],
+        "speech_rate": scan["word_count"] / (duration / 60) if duration > 0 else 0,
+        "pitch_variability": calculate_pitch_variability(y, sr),
+        "semantic_anomaly": scan["semantic_anomaly"],
+        "vague_word_count": scan["vague_word_count"],
+        "incomplete_sentence": scan["incomplete_sentence"],
+        "lost_words": scan["lost_words"]
     }
-    
+
     return features
 
+def _process_one(filename, dataset_path):
+    """Extract features for a single audio file (worker for process_dataset)."""
+    audio_path = os.path.join(dataset_path, 'audio', filename)
+    base_name = os.path.splitext(filename)[0]
+
+    # Try to find matching transcript
+    transcript_path = os.path.join(dataset_path, 'transcripts', f"{base_name}.txt")
+    transcript_text = None
+
+    if os.path.exists(transcript_path):
+        with open(transcript_path, 'r') as f:
+            transcript_text = f.read()
+
+    features = extract_features(audio_path, transcript_text)
+
+    return {
+        "file": filename,
+        **features
+    }
+
 def process_dataset(dataset_path, output_file=None):
     """
     Process all audio files in a dataset directory and extract features.
-    
+
+    Files are independent, so extraction runs in parallel across processes
+    (the regex/pure-Python stages hold the GIL, so threads wouldn't scale).
+
     Args:
         dataset_path: Path to the dataset directory containing audio/ and transcripts/ folders
         output_file: Optional path to save the results as JSON
-        
+
     Returns:
-        List of dictionaries containing file info and extracted features
+        Dict with 'files' (list of filenames) and 'features' (dict mapping
+        each feature name to a float32 ndarray, one entry per file)
     """
     audio_dir = os.path.join(dataset_path, 'audio')
-    
+
     if not os.path.exists(audio_dir):
         raise ValueError(f"Audio directory not found: {audio_dir}")
-    
-    results = []
-    
-    for filename in os.listdir(audio_dir):
-        if filename.endswith('.wav'):
-            audio_path = os.path.join(audio_dir, filename)
-            base_name = os.path.splitext(filename)[0]
-            
-            # Try to find matching transcript
-            transcript_path = os.path.join(dataset_path, 'transcripts', f"{base_name}.txt")
-            transcript_text = None
-            
-            if os.path.exists(transcript_path):
-                with open(transcript_path, 'r') as f:
-                    transcript_text = f.read()
-            
-            # Extract features
-            features = extract_features(audio_path, transcript_text)
-            
-            results.append({
-                "file": filename,
-                **features
-            })
-    
+
+    per_file = Parallel(n_jobs=-1, prefer='processes')(
+        delayed(_process_one)(filename, dataset_path)
+        for filename in os.listdir(audio_dir) if filename.endswith('.wav'))
+
+    # Pack into structure-of-arrays: one contiguous column per feature, so
+    # downstream matrix builds are cache-friendly and copy-free
+    files = [item['file'] for item in per_file]
+    features = {name: np.empty(len(per_file), dtype=np.float32) for name in FEATURE_NAMES}
+    for i, item in enumerate(per_file):
+        for name in FEATURE_NAMES:
+            features[name][i] = item[name]
+
+    results = {'files': files, 'features': features}
+
     # Save results if output file specified
     if output_file:
+        serializable = {
+            'files': files,
+            'features': {name: arr.tolist() for name, arr in features.items()}
+        }
         with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
-    
+            json.dump(serializable, f, indent=2)
+
     return results
 
 if __name__ == "__main__":
@@ -210,4 +294,4 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     results = process_dataset(args.dataset, args.output)
-    print(f"Processed {len(results)} files. Results saved to {args.output}")
\ No newline at end of file
+    print(f"Processed {len(results['files'])} files. Results saved to {args.output}")
\ No newline at end of file